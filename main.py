@@ -1,39 +1,59 @@
 # main.py
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
-from src.config import app_state, EXPECTED_API_KEY, EXPECTED_API_KEY_WS, MAX_WS_CONNECTIONS_PER_KEY
-from src.database import initialize_database
-from src.routes import api_router, websocket_router
+from src.config import CONFIG
+from src.database import initialize_database, warm_connection_pool, close_database
+from src.responses import ORJSONResponse
+from src.routes import api_router, websocket_router, health_router
+from src.websocket_manager import manager
+from src.ingest_writer import ingest_writer
 from src.logger_config import setup_logger
 
 # Setup logger
 logger = setup_logger(__name__)
 
-# Create FastAPI app
-app = FastAPI(title="Resilient Sensor API")
-
 # --- Robust Startup Logic ---
-@app.on_event("startup")
-async def on_startup():
-    """Application startup event handler."""
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown handler."""
     logger.info("Application starting...")
 
     # Check API key configurations
-    if not EXPECTED_API_KEY:
+    if not CONFIG.api_key:
         logger.warning("API_KEY (for HTTP endpoints) not defined. HTTP API endpoints might be unprotected or fail.")
 
-    if not EXPECTED_API_KEY_WS:
+    if not CONFIG.api_key_ws:
         logger.warning("API_KEY_WS (for WebSocket endpoint) not defined. WebSocket endpoint might be unprotected or fail.")
 
     # Log WebSocket connection limits
-    if MAX_WS_CONNECTIONS_PER_KEY == 0:
+    if CONFIG.max_ws_connections_per_key == 0:
         logger.info("MAX_WS_CONNECTIONS_PER_KEY not defined or set to 0. WebSocket connections will be UNLIMITED per API Key.")
     else:
-        logger.info(f"WebSocket connections limited to {MAX_WS_CONNECTIONS_PER_KEY} per API Key.")
+        logger.info(f"WebSocket connections limited to {CONFIG.max_ws_connections_per_key} per API Key.")
 
     # Initialize database
-    initialize_database()
+    await initialize_database()
+    await warm_connection_pool(CONFIG.db_pool_warm_size)
+
+    # Start the batched database writer
+    ingest_writer.start()
+
+    yield
+
+    logger.info("Application shutting down...")
+    await ingest_writer.stop()
+    await manager.stop()
+    await close_database()
+
+# Create FastAPI app
+app = FastAPI(
+    title="Resilient Sensor API",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
 
 # Include routers
 app.include_router(api_router)
 app.include_router(websocket_router)
+app.include_router(health_router)
@@ -0,0 +1,18 @@
+# run.py
+import os
+import uvicorn
+
+# Local entry point with the same server settings as the Docker image:
+# uvloop event loop, httptools HTTP parser and websockets protocol without
+# per-message compression (each small broadcast would be deflated once per client)
+if __name__ == "__main__":
+    uvicorn.run(
+        "main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+        ws_per_message_deflate=False,
+    )
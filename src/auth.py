@@ -1,20 +1,25 @@
 # auth.py
+import hmac
 from fastapi import HTTPException, status, Header
-from .config import EXPECTED_API_KEY, EXPECTED_API_KEY_WS
+from .config import CONFIG
 from .logger_config import setup_logger
 
 logger = setup_logger(__name__)
 
+# Expected keys, encoded once for constant-time comparison
+_EXPECTED_API_KEY_BYTES = (CONFIG.api_key or "").encode()
+_EXPECTED_API_KEY_WS_BYTES = (CONFIG.api_key_ws or "").encode()
+
 # --- Dependency to Verify API Key (for HTTP endpoint) ---
 async def verify_api_key(api_key: str = Header(None, alias="X-API-Key")):
     """Verify API key for HTTP endpoints."""
-    if not EXPECTED_API_KEY:
+    if not _EXPECTED_API_KEY_BYTES:
         logger.error("Server Error: Expected API key (HTTP) not configured.")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
             detail="Server configuration error."
         )
-    if not api_key or api_key != EXPECTED_API_KEY:
+    if not api_key or not hmac.compare_digest(api_key.encode(), _EXPECTED_API_KEY_BYTES):
         logger.warning("Attempt to access with invalid API Key (HTTP).")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, 
@@ -24,12 +29,12 @@ async def verify_api_key(api_key: str = Header(None, alias="X-API-Key")):
 
 def verify_websocket_api_key(api_key: str) -> bool:
     """Verify API key for WebSocket connections."""
-    if not EXPECTED_API_KEY_WS:
+    if not _EXPECTED_API_KEY_WS_BYTES:
         logger.error("Server Error: Expected API key (WebSocket) not configured.")
         return False
     
-    if not api_key or api_key != EXPECTED_API_KEY_WS:
-        logger.warning(f"Attempt to access WebSocket with invalid API Key: {api_key}")
+    if not api_key or not hmac.compare_digest(api_key.encode(), _EXPECTED_API_KEY_WS_BYTES):
+        logger.warning("Attempt to access WebSocket with invalid API Key.")
         return False
     
     return True
@@ -1,26 +1,52 @@
 # config.py
 import os
+from dataclasses import dataclass
+from typing import Optional
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
 # --- Environment Variables ---
-EXPECTED_API_KEY = os.getenv("API_KEY")
-EXPECTED_API_KEY_WS = os.getenv("API_KEY_WS")
-DATABASE_URL = os.getenv("DATABASE_URL")
+def _get_int_env(name: str, default: int) -> int:
+    """Read a non-negative integer from the environment, falling back to a default."""
+    value = os.getenv(name)
+    try:
+        if value:
+            return max(int(value), 0)  # Ensures it's not negative
+    except ValueError:
+        pass
+    return default
 
-# WebSocket connection limits
-MAX_WS_CONNECTIONS_PER_KEY_STR = os.getenv("MAX_WS_CONNECTIONS_PER_KEY")
-MAX_WS_CONNECTIONS_PER_KEY: int = 0  # Default to 0 (unlimited)
+def _get_log_level_env(name: str, default: str) -> str:
+    """Read a logging level name from the environment, falling back to a default if unknown."""
+    value = (os.getenv(name) or "").strip().upper()
+    if value in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"):
+        return value
+    return default
 
-try:
-    if MAX_WS_CONNECTIONS_PER_KEY_STR:
-        MAX_WS_CONNECTIONS_PER_KEY = int(MAX_WS_CONNECTIONS_PER_KEY_STR)
-        if MAX_WS_CONNECTIONS_PER_KEY < 0:  # Ensures it's not negative
-            MAX_WS_CONNECTIONS_PER_KEY = 0
-except ValueError:
-    MAX_WS_CONNECTIONS_PER_KEY = 0
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Application settings, read from the environment once at import time."""
+    api_key: Optional[str]
+    api_key_ws: Optional[str]
+    database_url: Optional[str]
+    max_ws_connections_per_key: int  # 0 means unlimited
+    db_pool_warm_size: int  # Connections opened on startup, 0 disables warm-up
+    db_pool_size: int  # Connections kept open in the pool, per worker
+    db_max_overflow: int  # Extra connections allowed under bursts, per worker
+    log_level: str  # Level name applied to every application logger
+
+CONFIG = Config(
+    api_key=os.getenv("API_KEY"),
+    api_key_ws=os.getenv("API_KEY_WS"),
+    database_url=os.getenv("DATABASE_URL"),
+    max_ws_connections_per_key=_get_int_env("MAX_WS_CONNECTIONS_PER_KEY", 0),
+    db_pool_warm_size=_get_int_env("DB_POOL_WARM_SIZE", 5),
+    db_pool_size=_get_int_env("DB_POOL_SIZE", 10),
+    db_max_overflow=_get_int_env("DB_MAX_OVERFLOW", 20),
+    log_level=_get_log_level_env("LOG_LEVEL", "INFO"),
+)
 
 # --- Global Application State ---
 class AppState:
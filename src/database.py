@@ -1,41 +1,76 @@
 # database.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+import asyncio
+from sqlalchemy import select, text
+from sqlalchemy.engine import make_url, URL
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
 from sqlalchemy.exc import OperationalError, ArgumentError, IntegrityError
-from typing import Optional
+from typing import Any, Dict, Optional
 
-from .config import DATABASE_URL, app_state
-from .models import Base
+from .config import CONFIG, app_state
+from .models import Base, DataDB
 from .logger_config import setup_logger
 
 logger = setup_logger(__name__)
 
 # --- Global Variables for Database (will be initialized on startup) ---
-engine = None
-SessionLocal = None
+engine: Optional[AsyncEngine] = None
+SessionLocal: Optional[async_sessionmaker[AsyncSession]] = None
 
-def initialize_database():
+DB_POOL_TIMEOUT = 5  # Seconds to wait for a free connection before failing
+
+# Latest reading, fetched as plain rows (no ORM identity map or instrumentation)
+_LAST_ROW_STMT = (
+    select(
+        DataDB.id,
+        DataDB.temperature,
+        DataDB.humidity,
+        DataDB.pressure,
+        DataDB.date_recorded,
+        DataDB.time_recorded,
+        DataDB.sensor_id,
+        DataDB.client_ip
+    )
+    .order_by(DataDB.id.desc())
+    .limit(1)
+)
+
+def _async_database_url(database_url: str) -> URL:
+    """Point plain PostgreSQL URLs at the asyncpg driver."""
+    url = make_url(database_url)
+    if url.drivername in ("postgres", "postgresql", "postgresql+psycopg2"):
+        url = url.set(drivername="postgresql+asyncpg")
+    return url
+
+async def initialize_database():
     """Initialize database connection and create tables."""
     global engine, SessionLocal
-    
-    if not DATABASE_URL:
+
+    if not CONFIG.database_url:
         app_state.db_is_connected = False
         logger.warning("DATABASE_URL not defined. The application will continue without saving data.")
         return
 
     try:
         logger.info("Configuring the database engine...")
-        engine = create_engine(DATABASE_URL, connect_args={"connect_timeout": 5})
-        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        engine = create_async_engine(
+            _async_database_url(CONFIG.database_url),
+            pool_size=CONFIG.db_pool_size,
+            max_overflow=CONFIG.db_max_overflow,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=1800,  # Recycle before the server drops idle connections
+            pool_pre_ping=True,  # Replace dead connections transparently on checkout
+            connect_args={"timeout": 5}
+        )
+        SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
 
         logger.info("Attempting to connect to the database...")
-        with engine.connect() as connection:
+        async with engine.begin() as connection:
             logger.info("Database connection established successfully.")
 
             # Table creation logic - safe for multiple workers
             try:
                 logger.info("Ensuring database tables are created...")
-                Base.metadata.create_all(bind=engine)
+                await connection.run_sync(Base.metadata.create_all)
                 logger.info("Tables are ready.")
             except IntegrityError:
                 logger.warning("Tables already exist, which is normal in a multi-worker environment. Continuing...")
@@ -43,7 +78,7 @@ def initialize_database():
 
         app_state.db_is_connected = True
 
-    except (OperationalError, ArgumentError) as e:
+    except (OperationalError, ArgumentError, OSError) as e:
         app_state.db_is_connected = False
         logger.error("STARTUP ERROR: Could not configure or connect to the database.")
         logger.warning("The application will continue to receive data, but NOTHING will be saved.")
@@ -54,21 +89,50 @@ def initialize_database():
 
     except Exception as e:
         app_state.db_is_connected = False
-        logger.exception(f"An unexpected error occurred during startup: {e}")
+        logger.exception("An unexpected error occurred during startup: %s", e)
 
-# --- Dependency to get Database Session ---
-def get_db():
-    """Dependency to get database session."""
-    if not app_state.db_is_connected or not SessionLocal:
-        yield None
+async def _ping_database():
+    """Check out a pooled connection and run a trivial query on it."""
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+async def warm_connection_pool(pool_size: int = 5):
+    """Open pool_size connections up front so the first requests don't pay for the handshake."""
+    if not app_state.db_is_connected or engine is None or pool_size <= 0:
         return
 
-    db = SessionLocal()
     try:
-        yield db
-    finally:
-        if db and app_state.db_is_connected:
-            try:
-                db.close()
-            except OperationalError:
-                pass
+        await asyncio.gather(*(_ping_database() for _ in range(pool_size)))
+        logger.info("Connection pool warmed with %d connections.", pool_size)
+    except Exception as e:
+        logger.warning("Could not warm the connection pool: %s", e)
+
+async def fetch_latest_reading() -> Optional[Dict[str, Any]]:
+    """Return the most recent reading as a plain dict, or None if there is none or no database."""
+    if not app_state.db_is_connected or SessionLocal is None:
+        return None
+
+    try:
+        async with SessionLocal() as session:
+            row = (await session.execute(_LAST_ROW_STMT)).mappings().first()
+        return dict(row) if row else None
+    except Exception as e:
+        logger.warning("Could not fetch the latest reading: %s", e)
+        return None
+
+def get_pool_status() -> Optional[str]:
+    """Describe the connection pool usage, or None if there is no engine."""
+    if engine is None:
+        return None
+    return engine.pool.status()
+
+async def close_database():
+    """Dispose of the engine and close all pooled connections."""
+    global engine, SessionLocal
+
+    app_state.db_is_connected = False
+    if engine is not None:
+        await engine.dispose()
+        logger.info("Database connections closed.")
+    engine = None
+    SessionLocal = None
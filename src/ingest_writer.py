@@ -0,0 +1,92 @@
+# ingest_writer.py
+import asyncio
+from sqlalchemy import insert
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import database
+from .models import DataDB
+from .logger_config import setup_logger
+
+logger = setup_logger(__name__)
+
+INGEST_QUEUE_SIZE = 10000
+INGEST_BATCH_SIZE = 200
+
+_PendingRow = Tuple[Dict[str, Any], asyncio.Future]
+
+# Built once; SQLAlchemy then reuses its compiled form for every batch
+_INSERT_STMT = insert(DataDB).returning(DataDB.id, sort_by_parameter_order=True)
+
+class IngestWriter:
+    """Writes sensor readings in batches, one multi-row INSERT and one commit per batch."""
+
+    def __init__(self):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=INGEST_QUEUE_SIZE)
+        self._drain_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the background task that writes queued readings."""
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.create_task(self._drain())
+
+    async def stop(self):
+        """Stop the background writer, failing any readings still waiting to be saved."""
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+            try:
+                await self._drain_task
+            except asyncio.CancelledError:
+                pass
+            self._drain_task = None
+
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Ingest writer stopped before the reading was saved."))
+
+    async def submit(self, row: Dict[str, Any]) -> int:
+        """Queue a reading and wait until its batch is committed, returning the new row ID."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future))  # Waits when the queue is full instead of growing unbounded
+        return await future
+
+    async def _drain(self):
+        """Write queued readings, taking everything pending (up to a batch) in one pass."""
+        while True:
+            batch: List[_PendingRow] = [await self._queue.get()]
+            while len(batch) < INGEST_BATCH_SIZE and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                await self._write(batch)
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError("Ingest writer stopped before the reading was saved."))
+                raise
+
+    async def _write(self, batch: List[_PendingRow]):
+        """Insert a batch of readings and resolve each caller's future with its row ID."""
+        try:
+            if database.SessionLocal is None:
+                raise RuntimeError("Database session factory is not initialized.")
+
+            async with database.SessionLocal() as session:
+                result = await session.execute(_INSERT_STMT, [row for row, _ in batch])
+                new_ids = result.scalars().all()
+                await session.commit()
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), new_id in zip(batch, new_ids):
+            if not future.done():  # The request may have been cancelled while waiting
+                future.set_result(new_id)
+
+        # One summary line per batch instead of one per request
+        logger.info("Saved %d reading(s) to the database (last ID: %s).", len(new_ids), new_ids[-1])
+
+# Global ingest writer instance
+ingest_writer = IngestWriter()
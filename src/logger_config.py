@@ -1,19 +1,27 @@
 # logger_config.py
+import atexit
 import logging
+import logging.handlers
+import queue
+from typing import Optional
 import colorlog
 
-def setup_logger(name: str = __name__) -> logging.Logger:
-    """Configure and return a colored logger."""
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-    
-    # Prevent adding multiple handlers if logger already exists
-    if logger.handlers:
-        return logger
-    
+from .config import CONFIG
+
+# Records are queued by the application and formatted/written by a background
+# thread, so log I/O never blocks the event loop
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def _start_listener():
+    """Start the shared background thread that writes queued log records."""
+    global _listener
+    if _listener is not None:
+        return
+
     # Create console handler
     console_handler = logging.StreamHandler()
-    
+
     # Define colored formatter using colorlog
     formatter = colorlog.ColoredFormatter(
         "%(log_color)s%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -27,11 +35,26 @@ def setup_logger(name: str = __name__) -> logging.Logger:
         secondary_log_colors={},
         style='%'
     )
-    
+
     # Add formatter to console handler
     console_handler.setFormatter(formatter)
-    
-    # Add handler to logger
-    logger.addHandler(console_handler)
-    
+
+    _listener = logging.handlers.QueueListener(_log_queue, console_handler)
+    _listener.start()
+    atexit.register(_listener.stop)  # Flush pending records on exit
+
+def setup_logger(name: str = __name__) -> logging.Logger:
+    """Configure and return a colored logger."""
+    logger = logging.getLogger(name)
+    logger.setLevel(CONFIG.log_level)
+
+    # Prevent adding multiple handlers if logger already exists
+    if logger.handlers:
+        return logger
+
+    _start_listener()
+
+    # Add queue handler to logger
+    logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+
     return logger
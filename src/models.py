@@ -1,7 +1,7 @@
 # models.py
-from sqlalchemy import Column, Integer, String, Float, Date, Time
+from sqlalchemy import Column, Integer, String, Float, Date, Time, Index, text
 from sqlalchemy.ext.declarative import declarative_base
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import date as date_type, time as time_type
 
@@ -11,15 +11,24 @@ Base = declarative_base()
 # --- SQLAlchemy Models (Database Tables) ---
 class DataDB(Base):
     __tablename__ = "data"
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)  # Already indexed as the primary key
     temperature = Column(Float, nullable=False)
     humidity = Column(Float, nullable=False)
     pressure = Column(Float, nullable=False)
-    date_recorded = Column(Date, nullable=False, index=True)
-    time_recorded = Column(Time, nullable=False, index=True)
-    sensor_id = Column(String, nullable=False, index=True)
+    date_recorded = Column(Date, nullable=False)
+    time_recorded = Column(Time, nullable=False, index=True)  # Grafana "latest value" panels
+    sensor_id = Column(String, nullable=False)
     client_ip = Column(String, nullable=True)
 
+    __table_args__ = (
+        # Latest reading for a given sensor is a single B-tree seek
+        Index("ix_data_sensor_id_id_desc", sensor_id, id.desc()),
+        # Matches the timestamp expression the Grafana panels filter and sort on
+        Index("ix_data_recorded_at", text("(CAST(date_recorded AS TIMESTAMP) + time_recorded)")),
+        # Rows arrive in date order, so a tiny BRIN index serves date range scans
+        Index("ix_data_date_recorded_brin", date_recorded, postgresql_using="brin"),
+    )
+
 # --- Pydantic Models ---
 class TemperatureReadingPayload(BaseModel):
     temperature: float
@@ -28,6 +37,8 @@ class TemperatureReadingPayload(BaseModel):
     sensor_id: str
 
 class TemperatureDataResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: Optional[int] = None
     temperature: float
     humidity: float  # CAMPO OBRIGATÓRIO: Umidade
@@ -36,6 +47,3 @@ class TemperatureDataResponse(BaseModel):
     time_recorded: time_type
     sensor_id: str
     client_ip: Optional[str] = None
-
-    class Config:
-        from_attributes = True
@@ -1,5 +1,6 @@
 # routes/__init__.py
 from .api_routes import router as api_router
 from .websocket_routes import router as websocket_router
+from .health_routes import router as health_router
 
-__all__ = ["api_router", "websocket_router"]
+__all__ = ["api_router", "websocket_router", "health_router"]
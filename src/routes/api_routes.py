@@ -1,12 +1,11 @@
 # routes/api_routes.py
-from fastapi import APIRouter, status, Depends, Request
-from sqlalchemy.orm import Session
-from typing import Optional
+import orjson
+from fastapi import APIRouter, status, Depends, Request, Response
 from datetime import datetime
-import pytz
+from zoneinfo import ZoneInfo
 
-from ..models import TemperatureReadingPayload, TemperatureDataResponse, DataDB
-from ..database import get_db
+from ..models import TemperatureReadingPayload, TemperatureDataResponse
+from ..ingest_writer import ingest_writer
 from ..auth import verify_api_key
 from ..config import app_state
 from ..websocket_manager import manager
@@ -15,82 +14,71 @@ from ..logger_config import setup_logger
 router = APIRouter()
 logger = setup_logger(__name__)
 
+BRASILIA_TZ = ZoneInfo("America/Sao_Paulo")
+
 # --- HTTP Endpoint to receive data ---
 @router.post(
     "/api/temperature_reading",
-    response_model=TemperatureDataResponse,
     status_code=status.HTTP_201_CREATED,
+    # The handler returns an already JSON-ready dict, so skip response_model
+    # re-validation and only document the schema
+    responses={status.HTTP_201_CREATED: {"model": TemperatureDataResponse}},
     dependencies=[Depends(verify_api_key)]
 )
 async def submit_temperature_reading_http(
     payload: TemperatureReadingPayload,
-    request: Request,
-    db: Optional[Session] = Depends(get_db)
+    request: Request
 ):
     """Submit temperature reading via HTTP."""
     client_ip = request.client.host if request.client else "unknown_ip"
     sensor_id = payload.sensor_id
 
-    logger.info(f"HTTP: AUTHENTICATED request from {client_ip} (sensor: {sensor_id})")
+    logger.debug("HTTP: AUTHENTICATED request from %s (sensor: %s)", client_ip, sensor_id)
 
     # Get current time in Brazil timezone
-    utc_now = datetime.now(pytz.utc)
-    brasilia_tz = pytz.timezone('America/Sao_Paulo')
-    brasilia_now = utc_now.astimezone(brasilia_tz)
-    date_to_store = brasilia_now.date()
-    time_to_store = brasilia_now.time().replace(microsecond=0)
+    now = datetime.now(BRASILIA_TZ).replace(microsecond=0)
+    date_to_store = now.date()
+    time_to_store = now.time()
 
     # Log received data
-    logger.info(
-        f"HTTP: Dados recebidos de {sensor_id}: "
-        f"Temp: {payload.temperature}°C, "
-        f"Umidade: {payload.humidity}%, "
-        f"Pressão: {payload.pressure} hPa"
+    logger.debug(
+        "HTTP: Dados recebidos de %s: Temp: %s°C, Umidade: %s%%, Pressão: %s hPa",
+        sensor_id, payload.temperature, payload.humidity, payload.pressure
     )
 
-    db_data_entry = None
+    # Reading fields, shared by the database row and the broadcast/response payload
+    reading = {
+        "temperature": payload.temperature,
+        "humidity": payload.humidity,
+        "pressure": payload.pressure,
+        "date_recorded": date_to_store,
+        "time_recorded": time_to_store,
+        "sensor_id": sensor_id,
+        "client_ip": client_ip
+    }
+    new_id = None
 
-    # Save to database if connected
-    if app_state.db_is_connected and db:
+    # Save to database if connected; the writer batches concurrent readings into one INSERT and commit
+    if app_state.db_is_connected:
         try:
-            db_data_entry = DataDB(
-                temperature=payload.temperature,
-                humidity=payload.humidity,
-                pressure=payload.pressure,
-                date_recorded=date_to_store,
-                time_recorded=time_to_store,
-                sensor_id=sensor_id,
-                client_ip=client_ip
-            )
-            db.add(db_data_entry)
-            db.commit()
-            db.refresh(db_data_entry)
-            logger.info(f"HTTP: Data from {sensor_id} saved to database. ID: {db_data_entry.id}")
+            new_id = await ingest_writer.submit(reading)
+            logger.debug("HTTP: Data from %s saved to database. ID: %s", sensor_id, new_id)
 
         except Exception as e:
-            if db: 
-                db.rollback()
-            app_state.db_is_connected = False
-            logger.error("REAL-TIME ERROR: Database connection lost. Data not saved.")
-            logger.error(f"Error detail: {e}")
-            db_data_entry = None
+            logger.error("REAL-TIME ERROR: Could not save data to the database.")
+            logger.error("Error detail: %s", e)
+            new_id = None
     else:
-        logger.warning(f"WARNING: Database unavailable. Data from {sensor_id} will not be saved.")
+        logger.warning("WARNING: Database unavailable. Data from %s will not be saved.", sensor_id)
 
-    # Create response data
-    data_to_broadcast = TemperatureDataResponse(
-        id=db_data_entry.id if db_data_entry else None,
-        temperature=payload.temperature,
-        humidity=payload.humidity,
-        pressure=payload.pressure,
-        date_recorded=date_to_store,
-        time_recorded=time_to_store,
-        sensor_id=sensor_id,
-        client_ip=client_ip
-    )
+    # Create response data (orjson writes the date/time fields in ISO format)
+    data_to_broadcast = {"id": new_id, **reading}
+
+    # Encode once and reuse the same bytes for the broadcast and the HTTP response
+    encoded = orjson.dumps(data_to_broadcast)
 
-    # Broadcast to WebSocket clients
-    await manager.broadcast_json(data_to_broadcast.model_dump(mode='json'))
-    logger.info(f"HTTP: Data from {sensor_id} broadcast to {len(manager.active_connections)} WebSocket clients.")
+    # Broadcast to WebSocket clients (the manager keeps it as the latest reading even if nobody is connected)
+    await manager.broadcast_json(encoded)
+    logger.debug("HTTP: Data from %s queued for broadcast to %d WebSocket clients.", sensor_id, len(manager.active_connections))
 
-    return data_to_broadcast
+    return Response(content=encoded, status_code=status.HTTP_201_CREATED, media_type="application/json")
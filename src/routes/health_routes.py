@@ -0,0 +1,25 @@
+# routes/health_routes.py
+from fastapi import APIRouter
+
+from ..config import app_state
+from ..database import get_pool_status
+from ..websocket_manager import manager
+from ..logger_config import setup_logger
+
+router = APIRouter()
+logger = setup_logger(__name__)
+
+# --- Health check (used by the container HEALTHCHECK) ---
+@router.get("/health")
+async def health_check():
+    """Report service health and connection pool usage."""
+    pool_status = get_pool_status()
+    if pool_status:
+        logger.debug("Health: %s", pool_status)
+
+    return {
+        "status": "ok",
+        "db_connected": app_state.db_is_connected,
+        "db_pool": pool_status,
+        "websocket_clients": len(manager.active_connections),
+    }
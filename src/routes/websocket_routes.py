@@ -1,12 +1,8 @@
 # routes/websocket_routes.py
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status, Depends, Query
-from sqlalchemy.orm import Session
-from typing import Optional
+from fastapi import APIRouter, WebSocket, status, Query
 
-from ..models import TemperatureDataResponse, DataDB
-from ..database import get_db
 from ..auth import verify_websocket_api_key
-from ..config import app_state, MAX_WS_CONNECTIONS_PER_KEY
+from ..config import CONFIG
 from ..websocket_manager import manager
 from ..logger_config import setup_logger
 
@@ -17,8 +13,7 @@ logger = setup_logger(__name__)
 @router.websocket("/ws/sensor_updates")
 async def websocket_sensor_updates_endpoint(
     websocket: WebSocket,
-    api_key: str = Query(..., alias="api-key"),
-    db: Optional[Session] = Depends(get_db)
+    api_key: str = Query(..., alias="api-key")
 ):
     """WebSocket endpoint for real-time sensor updates."""
     
@@ -27,45 +22,23 @@ async def websocket_sensor_updates_endpoint(
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid or missing API Key.")
         return
 
-    # Check connection limits
-    if (MAX_WS_CONNECTIONS_PER_KEY > 0 and 
-        manager.connections_per_key.get(api_key, 0) >= MAX_WS_CONNECTIONS_PER_KEY):
-        logger.warning(
-            f"WebSocket connection rejected for API Key '{api_key}': "
-            f"max connections ({MAX_WS_CONNECTIONS_PER_KEY}) reached. "
-            f"Client: {websocket.client.host}"
-        )
-        await websocket.close(
-            code=status.WS_1008_POLICY_VIOLATION, 
-            reason=f"Max connections ({MAX_WS_CONNECTIONS_PER_KEY}) for this API Key reached."
-        )
-        return
-
-    # Connect the WebSocket
+    # Connect the WebSocket; the manager enforces the per-key limit before accepting
+    # and queues the latest reading ahead of any broadcast
     connection_accepted = await manager.connect(websocket, api_key)
     if not connection_accepted:
+        await websocket.close(
+            code=status.WS_1008_POLICY_VIOLATION,
+            reason=f"Max connections ({CONFIG.max_ws_connections_per_key}) for this API Key reached."
+        )
         return
 
-    # Send last data entry if database is available
-    if app_state.db_is_connected and db:
-        try:
-            last_data_entry = db.query(DataDB).order_by(DataDB.id.desc()).first()
-            if last_data_entry:
-                await websocket.send_json(
-                    TemperatureDataResponse.from_orm(last_data_entry).model_dump(mode='json')
-                )
-        except Exception as e:
-            app_state.db_is_connected = False
-            logger.warning(f"WS: Error fetching last data, database now marked as offline: {e}")
-
-    # Keep connection alive
+    # Keep connection alive until the client goes away
+    # (inbound frames are discarded as raw ASGI messages, without decoding them as text)
     try:
-        while True:
-            await websocket.receive_text()
-    except WebSocketDisconnect:
-        logger.info("WebSocket disconnected gracefully.")
-        pass
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+        logger.debug("WebSocket disconnected gracefully.")
     except Exception as e:
-        logger.exception(f"Unexpected error in WebSocket: {e}")
+        logger.exception("Unexpected error in WebSocket: %s", e)
     finally:
         manager.disconnect(websocket)
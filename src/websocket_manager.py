@@ -1,76 +1,147 @@
 # websocket_manager.py
-from fastapi import WebSocket
-from typing import List, Dict
-from .config import MAX_WS_CONNECTIONS_PER_KEY
+import asyncio
+import orjson
+from collections import defaultdict
+from fastapi import WebSocket, status
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Union
+from .config import CONFIG
+from .database import fetch_latest_reading
 from .logger_config import setup_logger
 
 logger = setup_logger(__name__)
 
+CLIENT_QUEUE_SIZE = 256
+SEND_TIMEOUT_SECONDS = 5.0
+
+SendText = Callable[[str], Awaitable[None]]
+
 class ConnectionManager:
     """WebSocket connection manager."""
     
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
-        self.connections_per_key: Dict[str, int] = {}
-        self.websocket_to_key_map: Dict[WebSocket, str] = {}
+        # Each connection has its own bounded outbox and writer task, so a slow client only delays itself
+        self.active_connections: Dict[WebSocket, Tuple[asyncio.Queue, asyncio.Task]] = {}
+        self.connections_per_key: Dict[str, int] = defaultdict(int)
+        # Most recent broadcast, replayed to new clients when the database is unavailable
+        self._last_message: Optional[Union[dict, bytes]] = None
+
+    async def stop(self):
+        """Stop every client's writer task."""
+        tasks = [task for _, task in self.active_connections.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
     async def connect(self, websocket: WebSocket, api_key: str) -> bool:
         """Connect a new WebSocket client."""
-        if (MAX_WS_CONNECTIONS_PER_KEY > 0 and 
-            self.connections_per_key.get(api_key, 0) >= MAX_WS_CONNECTIONS_PER_KEY):
+        count = self.connections_per_key[api_key]
+        if CONFIG.max_ws_connections_per_key > 0 and count >= CONFIG.max_ws_connections_per_key:
             logger.warning(
-                f"WebSocket connection rejected for API Key '{api_key}': "
-                f"max connections ({MAX_WS_CONNECTIONS_PER_KEY}) reached. "
-                f"Client: {websocket.client.host}"
+                "WebSocket connection rejected: max connections (%d) for this API Key reached. Client: %s",
+                CONFIG.max_ws_connections_per_key, websocket.client.host
             )
             return False
 
-        await websocket.accept()
-        self.active_connections.append(websocket)
-        self.connections_per_key[api_key] = self.connections_per_key.get(api_key, 0) + 1
-        self.websocket_to_key_map[websocket] = api_key
+        # Reserve the slot before awaiting accept(), so concurrent connects can't both pass the limit check
+        self.connections_per_key[api_key] = count + 1
+        try:
+            await websocket.accept()
+            # Replay the newest stored reading, which may have come in through another worker;
+            # the in-process copy only stands in when the database can't provide one
+            latest = await fetch_latest_reading()
+        except BaseException:  # Includes cancellation while the handshake or lookup is pending
+            self._release_key(api_key)
+            raise
+
+        replay = latest if latest is not None else self._last_message
+        initial_message = self._encode(replay) if replay is not None else None
+
+        outbox: asyncio.Queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        if initial_message is not None:
+            outbox.put_nowait(initial_message)
+        writer = asyncio.create_task(self._write(websocket, websocket.send_text, outbox))
+        self.active_connections[websocket] = (outbox, writer)
+        websocket.state.api_key = api_key
         
-        logger.info(
-            f"New WebSocket client: {websocket.client.host} (Key: {api_key}). "
-            f"Total connections for this key: {self.connections_per_key[api_key]}. "
-            f"Global total: {len(self.active_connections)}"
+        logger.debug(
+            "New WebSocket client: %s. Total connections for this key: %d. Global total: %d",
+            websocket.client.host, self.connections_per_key[api_key], len(self.active_connections)
         )
         return True
 
+    def _release_key(self, api_key: str) -> int:
+        """Give back one connection slot for an API key, returning how many remain."""
+        remaining = self.connections_per_key[api_key] - 1
+        if remaining <= 0:
+            del self.connections_per_key[api_key]
+            return 0
+        self.connections_per_key[api_key] = remaining
+        return remaining
+
     def disconnect(self, websocket: WebSocket):
         """Disconnect a WebSocket client."""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-            api_key = self.websocket_to_key_map.pop(websocket, None)
-            if api_key:
-                self.connections_per_key[api_key] = self.connections_per_key.get(api_key, 1) - 1
-                if self.connections_per_key[api_key] <= 0:
-                    del self.connections_per_key[api_key]
-                logger.warning(
-                    f"WebSocket client disconnected. "
-                    f"Total connections for key '{api_key}': {self.connections_per_key.get(api_key, 0)}. "
-                    f"Global total: {len(self.active_connections)}"
-                )
-            else:
-                logger.warning(
-                    f"WebSocket client disconnected (key not mapped). "
-                    f"Global total: {len(self.active_connections)}"
-                )
+        client = self.active_connections.pop(websocket, None)
+        if client is None:
+            logger.debug("Attempted to disconnect a non-active WebSocket.")
+            return
+        client[1].cancel()  # Stop the writer, dropping anything still in its outbox
+
+        api_key = getattr(websocket.state, "api_key", None)
+        if api_key:
+            remaining = self._release_key(api_key)
+            logger.debug(
+                "WebSocket client disconnected. Total connections for its key: %d. Global total: %d",
+                remaining, len(self.active_connections)
+            )
         else:
-            logger.warning("Attempted to disconnect a non-active WebSocket.")
-
-    async def broadcast_json(self, data: dict):
-        """Broadcast JSON data to all connected clients."""
-        disconnected = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(data)
-            except Exception:
-                disconnected.append(connection)
-        
-        # Clean up disconnected clients
-        for ws_to_remove in disconnected:
-            self.disconnect(ws_to_remove)
+            logger.debug(
+                "WebSocket client disconnected (key not mapped). Global total: %d",
+                len(self.active_connections)
+            )
+
+    async def broadcast_json(self, data: Union[dict, bytes]):
+        """Queue JSON data (a dict, or an already-encoded JSON document) for delivery to all connected clients."""
+        self._last_message = data
+
+        if not self.active_connections:
+            return  # Nobody is listening, skip encoding and the fan-out loop
+
+        # Encode once; every client's outbox gets the same string
+        message = self._encode(data)
+
+        for outbox, _ in self.active_connections.values():
+            if outbox.full():
+                outbox.get_nowait()  # Drop this client's oldest message rather than block the caller
+                logger.warning("WebSocket client outbox full. Dropping its oldest message.")
+            outbox.put_nowait(message)
+
+    @staticmethod
+    def _encode(data: Union[dict, bytes]) -> str:
+        """Encode a message for the wire, passing pre-encoded JSON through untouched."""
+        if isinstance(data, bytes):
+            return data.decode()
+        return orjson.dumps(data).decode()
+
+    async def _write(self, websocket: WebSocket, send_text: SendText, outbox: asyncio.Queue):
+        """Deliver one client's queued messages in order until it fails or is disconnected."""
+        try:
+            while True:
+                message = await outbox.get()
+                await asyncio.wait_for(send_text(message), timeout=SEND_TIMEOUT_SECONDS)
+        except Exception:
+            # Covers disconnects as well as clients too slow to drain their socket
+            logger.debug("WebSocket send failed, disconnecting client.", exc_info=True)
+
+        # Close before unregistering (disconnect() cancels this task), so the endpoint's
+        # receive loop ends and a live-but-slow client reconnects instead of going silent
+        try:
+            await asyncio.wait_for(
+                websocket.close(code=status.WS_1011_INTERNAL_ERROR),
+                timeout=SEND_TIMEOUT_SECONDS
+            )
+        except Exception:
+            pass  # Already closed or unreachable
+        self.disconnect(websocket)
 
 # Global connection manager instance
 manager = ConnectionManager()